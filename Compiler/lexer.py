@@ -1,4 +1,5 @@
 import re
+import sys
 import difflib
 
 # -----------------------------------------------------------------------------
@@ -14,36 +15,130 @@ class Token:
         return f"Line {self.line:<3} | {self.type:<20} | {self.value}"
 
 
+# -----------------------------------------------------------------------------
+# Language Vocabulary (shared with the editor's syntax highlighter)
+# -----------------------------------------------------------------------------
+PRIMITIVE_TYPES = frozenset({'int', 'char', 'bool', 'double', 'float', 'string'})
+
+CONTRACT_KEYWORDS = frozenset({'requires', 'ensures', 'invariant'})
+
+KEYWORDS = frozenset({
+    # Declarations & Structures
+    'func', 'main', 'let', 'var', 'type', 'struct', 'void',
+
+    # Contracts & Verification
+    'old', 'result',
+
+    # Control Flow
+    'if', 'else', 'switch', 'case', 'default', 'break',
+    'while', 'do', 'for', 'return',
+
+    # I/O
+    'display', 'read'
+}) | PRIMITIVE_TYPES | CONTRACT_KEYWORDS
+
+
+# -----------------------------------------------------------------------------
+# Token Rules (order matters: earlier rules win)
+# -----------------------------------------------------------------------------
+TOKEN_RULES = [
+    # --- 1. Comments ---
+    ('COMMENT_MULTI',    r'/\*[\s\S]*?\*/'),
+    ('COMMENT_SINGLE',   r'//.*'),
+    ('ERR_UNTERM_CMT',   r'/\*[\s\S]*'),
+
+    # --- 2. Invalid Literals & Identifiers ---
+    ('ERR_FLOAT',        r'\d+\.\d+(\.\d+)+'),
+    ('ERR_ID_DIGIT',     r'\d+[a-zA-Z_]+'),
+    ('ERR_ID_HYPHEN',    r'[a-zA-Z_]\w*-\w+'), 
+
+    # --- 3. Valid Literals ---
+    ('CHAR_LITERAL',     r"'(\\.|[^'\\])'"),
+    ('ERR_SINGLE_QUOTE', r"'[^']*'"), 
+    ('STRING_LITERAL',   r'"(\\.|[^"\\])*"'),
+    ('UNTERM_STRING',    r'"[^"\n]*'),
+    ('FLOAT_LITERAL',    r'\d+\.\d+'),
+    ('INTEGER_LITERAL',  r'\d+'),
+
+    # --- 4. Invalid Operators ---
+    ('ERR_OP_TRIPLE_EQ', r'==='),
+    ('ERR_OP_REL_REV',   r'=<'),
+    ('ERR_OP_DBL_NOT',   r'!!'),
+    ('ERR_OP_DBL_DASH',  r'--(?=\d)'), 
+
+    # --- 5. Valid Operators ---
+    ('OP_ARROW',         r'->'),
+    ('OP_EQ',            r'=='),
+    ('OP_NEQ',           r'!='),
+    ('OP_GE',            r'>='),
+    ('OP_LE',            r'<='),
+    ('OP_AND',           r'&&'),
+    ('OP_OR',            r'\|\|'),
+    ('OP_INC',           r'\+\+'),
+    ('OP_DEC',           r'--'),
+    ('OP_ADD_ASS',       r'\+='),
+    ('OP_SUB_ASS',       r'-='),
+    ('OP_MUL_ASS',       r'\*='),
+    ('OP_DIV_ASS',       r'/='),
+    ('OP_MOD_ASS',       r'%='),
+    ('OP_SHL',           r'<<'),
+    ('OP_SHR',           r'>>'),
+    ('OP_BIT_AND',       r'&'),
+    ('OP_BIT_OR',        r'\|'),
+    ('OP_BIT_XOR',       r'\^'),
+    ('OP_BIT_NOT',       r'~'),
+
+    # --- 6. Symbols ---
+    ('SYMBOL',           r'[+\-*/%=!><(){}\[\],;:\.\?]'),
+
+    # --- 7. Illegal Characters ---
+    ('ERR_ILLEGAL_CHAR', r'[@#]'),
+
+    # --- 8. Identifiers / Keywords ---
+    ('WORD',             r'[a-zA-Z_][a-zA-Z0-9_]*'),
+
+    # --- 9. Whitespace ---
+    ('NEWLINE',          r'\n'),
+    ('SKIP',             r'[ \t]+'),
+
+    # --- 10. Catch-all ---
+    ('MISMATCH',         r'.'),
+]
+
+# Identifier naming checks test against this set in one C-level call, not a per-char loop
+_UPPERCASE = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+# Error rules and the message each one reports ({value} is the offending lexeme)
+ERROR_MESSAGES = {
+    'ERR_UNTERM_CMT':   "Unterminated multi-line comment",
+    'UNTERM_STRING':    "Unterminated string literal",
+    'ERR_FLOAT':        "Invalid numeric literal '{value}'",
+    'ERR_SINGLE_QUOTE': "Invalid character literal '{value}'. Char literals must contain exactly one character.",
+    'ERR_ID_DIGIT':     "Invalid identifier '{value}'. Cannot start with a digit.",
+    'ERR_ID_HYPHEN':    "Invalid identifier '{value}'. Hyphens are not allowed.",
+    'ERR_ILLEGAL_CHAR': "Illegal character '{value}'.",
+    'ERR_OP_TRIPLE_EQ': "Invalid operator '{value}'.",
+    'ERR_OP_REL_REV':   "Invalid operator '{value}'.",
+    'ERR_OP_DBL_NOT':   "Invalid operator '{value}'.",
+    'ERR_OP_DBL_DASH':  "Invalid operator '{value}'.",
+    'MISMATCH':         "Unexpected character '{value}'",
+}
+
+# Compiled once at import; every LuminaLexer shares it
+_MASTER_REGEX = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_RULES))
+
+
 # -----------------------------------------------------------------------------
 # Lumina Lexer
 # -----------------------------------------------------------------------------
 class LuminaLexer:
-    def __init__(self, source_code):
-        self.source_code = source_code
-        self.tokens = []
-        self.errors = []
-        self.line_number = 1
+    def __init__(self, source_code=""):
+        self.reset(source_code)
 
         # ---------------- Language Sets ----------------
 
         # Keywords
-        self.keywords = {
-            # Declarations & Structures
-            'func', 'main', 'let', 'var', 'type', 'struct', 'void',
-            
-            # Primitive Types
-            'int', 'char', 'bool', 'double', 'float', 'string',
-
-            # Contracts & Verification
-            'requires', 'ensures', 'invariant', 'old', 'result',
-            
-            # Control Flow
-            'if', 'else', 'switch', 'case', 'default', 'break',
-            'while', 'do', 'for', 'return',
-            
-            # I/O
-            'display', 'read'
-        }
+        self.keywords = KEYWORDS
 
         # Reserved literals
         self.reserved_words = {'null'} 
@@ -64,88 +159,34 @@ class LuminaLexer:
             'print':    "Invalid keyword. Use 'display'."
         }
         
-        self.primitive_types = {'int', 'char', 'bool', 'double', 'float', 'string'}
+        self.primitive_types = PRIMITIVE_TYPES
 
         # --- OPTIMIZATION: Combine all reserved words for typo checking ---
         self.all_vocab = list(self.keywords) + list(self.reserved_words) + ['true', 'false']
 
+    def reset(self, source_code):
+        """Point the lexer at new source, keeping its language tables"""
+        self.source_code = source_code
+        self.tokens = []
+        self.errors = []
+        self.line_number = 1
+
     # -----------------------------------------------------------------------------
     # Tokenization
     # -----------------------------------------------------------------------------
     def tokenize(self):
-        self.tokens.clear()
-        self.errors.clear()
+        # Fresh list, so results handed out by an earlier run are never emptied
+        self.tokens = list(self)
+        return self.tokens
+
+    def __iter__(self):
+        """Yield tokens as they are scanned; errors still collect in self.errors"""
+        self.errors = []
         self.line_number = 1
         
         last_keyword = None 
 
-        rules = [
-            # --- 1. Comments ---
-            ('COMMENT_MULTI',    r'/\*[\s\S]*?\*/'),
-            ('COMMENT_SINGLE',   r'//.*'),
-            ('ERR_UNTERM_CMT',   r'/\*[\s\S]*'),
-
-            # --- 2. Invalid Literals & Identifiers ---
-            ('ERR_FLOAT',        r'\d+\.\d+(\.\d+)+'),
-            ('ERR_ID_DIGIT',     r'\d+[a-zA-Z_]+'),
-            ('ERR_ID_HYPHEN',    r'[a-zA-Z_]\w*-\w+'), 
-
-            # --- 3. Valid Literals ---
-            ('CHAR_LITERAL',     r"'(\\.|[^'\\])'"),
-            ('ERR_SINGLE_QUOTE', r"'[^']*'"), 
-            ('STRING_LITERAL',   r'"(\\.|[^"\\])*"'),
-            ('UNTERM_STRING',    r'"[^"\n]*'),
-            ('FLOAT_LITERAL',    r'\d+\.\d+'),
-            ('INTEGER_LITERAL',  r'\d+'),
-
-            # --- 4. Invalid Operators ---
-            ('ERR_OP_TRIPLE_EQ', r'==='),
-            ('ERR_OP_REL_REV',   r'=<'),
-            ('ERR_OP_DBL_NOT',   r'!!'),
-            ('ERR_OP_DBL_DASH',  r'--(?=\d)'), 
-
-            # --- 5. Valid Operators ---
-            ('OP_ARROW',         r'->'),
-            ('OP_EQ',            r'=='),
-            ('OP_NEQ',           r'!='),
-            ('OP_GE',            r'>='),
-            ('OP_LE',            r'<='),
-            ('OP_AND',           r'&&'),
-            ('OP_OR',            r'\|\|'),
-            ('OP_INC',           r'\+\+'),
-            ('OP_DEC',           r'--'),
-            ('OP_ADD_ASS',       r'\+='),
-            ('OP_SUB_ASS',       r'-='),
-            ('OP_MUL_ASS',       r'\*='),
-            ('OP_DIV_ASS',       r'/='),
-            ('OP_MOD_ASS',       r'%='),
-            ('OP_SHL',           r'<<'),
-            ('OP_SHR',           r'>>'),
-            ('OP_BIT_AND',       r'&'),
-            ('OP_BIT_OR',        r'\|'),
-            ('OP_BIT_XOR',       r'\^'),
-            ('OP_BIT_NOT',       r'~'),
-
-            # --- 6. Symbols ---
-            ('SYMBOL',           r'[+\-*/%=!><(){}\[\],;:\.\?]'),
-
-            # --- 7. Illegal Characters ---
-            ('ERR_ILLEGAL_CHAR', r'[@#]'),
-
-            # --- 8. Identifiers / Keywords ---
-            ('WORD',             r'[a-zA-Z_][a-zA-Z0-9_]*'),
-
-            # --- 9. Whitespace ---
-            ('NEWLINE',          r'\n'),
-            ('SKIP',             r'[ \t]+'),
-
-            # --- 10. Catch-all ---
-            ('MISMATCH',         r'.'),
-        ]
-
-        master_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in rules)
-
-        for match in re.finditer(master_regex, self.source_code):
+        for match in _MASTER_REGEX.finditer(self.source_code):
             kind = match.lastgroup
             value = match.group()
 
@@ -158,43 +199,17 @@ class LuminaLexer:
                 self.line_number += value.count('\n')
                 continue
 
+            # Lexemes repeat heavily (names, keywords, punctuation); share one string per spelling.
+            # Token types need no interning: they are rule names and literals, already shared.
+            value = sys.intern(value)
+
             # --- Error Handling ---
-            if kind == 'ERR_UNTERM_CMT':
-                self._error("Unterminated multi-line comment")
-                self.line_number += value.count('\n')
-                self._add_token('INVALID', value)
-                continue
-            if kind == 'UNTERM_STRING':
-                self._error("Unterminated string literal")
-                self._add_token('INVALID', value)
-                continue
-            if kind == 'ERR_FLOAT':
-                self._error(f"Invalid numeric literal '{value}'")
-                self._add_token('INVALID', value)
-                continue
-            if kind == 'ERR_SINGLE_QUOTE':
-                self._error(f"Invalid character literal '{value}'. Char literals must contain exactly one character.")
-                self._add_token('INVALID', value)
-                continue
-            if kind == 'ERR_ID_DIGIT':
-                self._error(f"Invalid identifier '{value}'. Cannot start with a digit.")
-                self._add_token('INVALID', value)
-                continue
-            if kind == 'ERR_ID_HYPHEN':
-                self._error(f"Invalid identifier '{value}'. Hyphens are not allowed.")
-                self._add_token('INVALID', value)
-                continue
-            if kind == 'ERR_ILLEGAL_CHAR':
-                self._error(f"Illegal character '{value}'.")
-                self._add_token('INVALID', value)
-                continue
-            if kind.startswith('ERR_OP'):
-                self._error(f"Invalid operator '{value}'.")
-                self._add_token('INVALID', value)
-                continue
-            if kind == 'MISMATCH':
-                self._error(f"Unexpected character '{value}'")
-                self._add_token('INVALID', value)
+            message = ERROR_MESSAGES.get(kind)
+            if message is not None:
+                self._error(message.format(value=value))
+                if kind == 'ERR_UNTERM_CMT':
+                    self.line_number += value.count('\n')
+                yield Token('INVALID', value, self.line_number)
                 continue
 
             # --- Word Classification ---
@@ -218,10 +233,9 @@ class LuminaLexer:
             else:
                 last_keyword = None
 
-            self._add_token(kind, value)
+            yield Token(kind, value, self.line_number)
 
-        self.tokens.append(Token('EOF', 'EOF', self.line_number))
-        return self.tokens
+        yield Token('EOF', 'EOF', self.line_number)
 
     # -----------------------------------------------------------------------------
     # Helper Methods
@@ -291,7 +305,7 @@ class LuminaLexer:
 
         # CASE 1: Function Identifier (after 'func')
         if last_keyword == 'func':
-            if any(c.isupper() for c in value):
+            if not _UPPERCASE.isdisjoint(value):
                 self._error(f"Invalid function identifier '{value}'. Must be snake_case.")
                 return 'INVALID'
             return 'ID_VAR_FUNC'
@@ -311,7 +325,7 @@ class LuminaLexer:
             if value[0].isupper():
                 self._error(f"Invalid variable identifier '{value}'. Variables must start with a lowercase letter.")
                 return 'INVALID'
-            if any(c.isupper() for c in value):
+            if not _UPPERCASE.isdisjoint(value):
                 self._error(f"Invalid variable identifier '{value}'. Must be snake_case (no uppercase).")
                 return 'INVALID'
             return 'ID_VAR'
@@ -327,8 +341,5 @@ class LuminaLexer:
         
         return 'ID_VAR'
 
-    def _add_token(self, kind, value):
-        self.tokens.append(Token(kind, value, self.line_number))
-
     def _error(self, message):
         self.errors.append(f"Lexical Error (Line {self.line_number}): {message}")
\ No newline at end of file
@@ -1,7 +1,10 @@
+import sys
 import tkinter as tk
 from ui.ide_window import LuminaIDE
 
 if __name__ == "__main__":
+    # Hand the GIL back to the Tk loop more often while the lexer thread runs
+    sys.setswitchinterval(0.005)
     root = tk.Tk()
     app = LuminaIDE(root)
     root.mainloop()
@@ -1,14 +1,195 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+import tkinter.font as tkfont
 import customtkinter as ctk
 import re
+from bisect import bisect_right
 import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import csv
+import io
+from collections import Counter
+from functools import lru_cache
+from operator import attrgetter
 from PIL import Image 
 from datetime import datetime
 
+# The third-party regex engine is faster on large buffers, fall back to re without it
+try:
+    import regex as _hl_re
+except ImportError:
+    _hl_re = re
+
+# Parquet token table export is only offered when pyarrow is installed
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
 # --- IMPORT ADJUSTMENT ---
-from compiler.lexer import LuminaLexer 
+from compiler.lexer import LuminaLexer, KEYWORDS, PRIMITIVE_TYPES, CONTRACT_KEYWORDS
+
+__all__ = ["LuminaIDE", "TabbedEditor"]
+
+# Quiet period after a scroll, paste or comment edit before re-highlighting the view
+HIGHLIGHT_DELAY_MS = 60
+
+# Closed tab headers kept around for reuse
+TAB_HEADER_POOL_SIZE = 8
+
+# How often the Tk loop checks whether background work has finished
+BACKGROUND_POLL_MS = 30
+
+# Write buffer for token table exports, large enough that big tables flush in a few syscalls
+EXPORT_BUFFER_BYTES = 1 << 20
+
+# Token table rows inserted at a time, so large results never freeze the UI
+TOKEN_BATCH_ROWS = 500
+
+# Scroll position (fraction of loaded rows) at which the next batch is loaded
+TOKEN_PREFETCH_AT = 0.9
+
+# Number of recent lexer results kept, keyed by source text
+LEX_CACHE_SIZE = 8
+
+# Lines kept in the terminal panel; older output is dropped
+CONSOLE_MAX_LINES = 2000
+
+# Process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# File types offered when saving the token table
+_TOKEN_TABLE_FILETYPES = [("Text Files", "*.txt"), ("CSV Files", "*.csv")]
+if pa is not None:
+    _TOKEN_TABLE_FILETYPES.append(("Parquet Files", "*.parquet"))
+_TOKEN_TABLE_FILETYPES.append(("All Files", "*.*"))
+
+# Rules and column header of the text token table export
+_TXT_RULE = "-" * 60 + "\n"
+_TXT_DOUBLE_RULE = "=" * 60 + "\n"
+_TXT_HEADER = "Line".ljust(6) + " | " + "Token Type".ljust(20) + " | Lexeme\n"
+
+# Lexemes containing any of these need csv quoting; line numbers and token types never do
+_CSV_NEEDS_QUOTING = re.compile(r'[,"\r\n]').search
+
+# Pulls the three table fields off a lexer token in one C-level call
+_token_fields = attrgetter("line", "type", "value")
+
+# --- Highlighter Patterns ---
+# Order matters: earlier entries win, so COMMENT must stay first.
+# Identifiers are matched as WORD and resolved to a tag through _HL_WORD_TAGS,
+# which is built from the lexer's own vocabulary so the two never disagree.
+# The block comment is written as an unrolled loop so it never backtracks.
+_HL_PATTERNS = (
+    ("COMMENT", r'//.*|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/'),
+    ("STRING",  r'"[^"]*"'),
+    ("WORD",    r'\b[A-Za-z_][A-Za-z0-9_]*'),
+    ("NUMBER",  r'\b\d+\b'),
+)
+_HL_UNION = _hl_re.compile("|".join(f"(?P<{tag}>{regex})" for tag, regex in _HL_PATTERNS))
+_HL_TAGS = ("KEYWORD", "TYPE", "STRING", "COMMENT", "NUMBER", "CONTRACT")
+_HL_WORD_TAGS = {
+    **dict.fromkeys(KEYWORDS, "KEYWORD"),
+    **dict.fromkeys(CONTRACT_KEYWORDS, "CONTRACT"),
+    **dict.fromkeys(PRIMITIVE_TYPES | {"void"}, "TYPE"),
+}
+
+# Keys that move the cursor or modify other keys without changing the text
+_NAV_KEYSYMS = frozenset({
+    "Left", "Right", "Up", "Down", "Home", "End", "Prior", "Next",
+    "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R",
+    "Meta_L", "Meta_R", "Super_L", "Super_R", "Caps_Lock", "Escape",
+})
+
+# --- Token Table Categories ---
+# Each token type maps to one category, used both as its row tag and by the filter menu
+_LITERAL_MARKERS = ("STRING", "INTEGER", "FLOAT", "CHAR", "BOOL")
+_TOKEN_CATEGORIES = {}
+_FILTER_CATEGORIES = {
+    "Show: Errors": "ERROR",
+    "Show: Identifiers": "ID",
+    "Show: Keywords": "KEYWORD",
+    "Show: Literals": "LITERAL",
+    "Show: Noise Words": "NOISE",
+    "Show: Operators": "OP",
+    "Show: Symbols": "SYMBOL",
+}
+
+
+def _token_category(t_type):
+    """Category of a token type, worked out once per distinct type"""
+    category = _TOKEN_CATEGORIES.get(t_type)
+    if category is None:
+        upper = str(t_type).upper()
+        if "INVALID" in upper or "ERROR" in upper or "UNKNOWN" in upper:
+            category = "ERROR"
+        elif any(lit in upper for lit in _LITERAL_MARKERS):
+            category = "LITERAL"
+        elif "KEYWORD" in upper:
+            category = "KEYWORD"
+        elif "ID" in upper:
+            category = "ID"
+        elif "OP" in upper:
+            category = "OP"
+        elif "SYMBOL" in upper:
+            category = "SYMBOL"
+        elif "NOISE" in upper:
+            category = "NOISE"
+        else:
+            category = "NORMAL"
+        _TOKEN_CATEGORIES[t_type] = category
+    return category
+
+
+class _TokenColumns:
+    """Token table data stored column-wise: row strings and row category, index-aligned"""
+    __slots__ = ("rows", "categories", "selections")
+
+    def __init__(self, rows=(), categories=()):
+        self.rows = list(rows)
+        self.categories = list(categories)
+        # Columns already picked out per category; categories are disjoint, so at most one more copy
+        self.selections = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def select(self, category):
+        """Columns holding only the tokens of one category, scanned once per category"""
+        selected = self.selections.get(category)
+        if selected is None:
+            rows = self.rows
+            picked = [rows[i] for i, c in enumerate(self.categories) if c == category]
+            selected = self.selections[category] = _TokenColumns(picked, [category] * len(picked))
+        return selected
+
+
+# Shared empty result; never modified
+_NO_TOKENS = _TokenColumns()
+
+
+def _normalize_tokens(tokens):
+    """Table columns for lexer tokens; row strings and category are worked out once here"""
+    rows, categories = [], []
+    add_row, add_category = rows.append, categories.append
+    for line, t_type, value in map(_token_fields, tokens):
+        add_row((str(line), str(t_type), str(value)))
+        add_category(_token_category(t_type))
+    return _TokenColumns(rows, categories)
+
+
+@lru_cache(maxsize=4096)
+def _text_row_tail(token_type, lexeme):
+    """Type and lexeme columns of a text export row; token vocabularies repeat, so most rows hit"""
+    if len(lexeme) > 30:
+        lexeme = lexeme[:27] + "..."
+    return " | " + token_type.ljust(20) + " | " + lexeme + "\n"
+
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("dark-blue")
@@ -21,6 +202,13 @@ class TabbedEditor(ctk.CTkFrame):
         self.current_file = None
         self.tabs = {}  
         self.tab_counter = 0   
+        self.active_tab_id = None
+        self.highlight_after_id = None
+        # Work queued for the next highlight flush: edited line numbers, or a whole view pass
+        self.dirty_lines = set()
+        self.highlight_full = False
+        # Headers of closed tabs, kept for reuse by the next new tab
+        self.header_pool = []
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
         
@@ -43,73 +231,86 @@ class TabbedEditor(ctk.CTkFrame):
         # --- Editor Area ---
         self.editor_area = ctk.CTkFrame(self, fg_color=self.main_app.colors["editor"], corner_radius=0)
         self.editor_area.grid(row=1, column=0, sticky="nsew", padx=0, pady=0)
-        
+
+        # Text Editor Widget (shared by all tabs, each tab keeps its own buffer)
+        self.editor = tk.Text(self.editor_area,
+                              bg=self.main_app.colors["editor"],
+                              fg=self.main_app.colors["text"],
+                              font=("JetBrains Mono", 11),
+                              insertbackground=self.main_app.colors["accent"],
+                              selectbackground="#1e293b",
+                              relief=tk.FLAT,
+                              borderwidth=0,
+                              highlightthickness=0)
+        self.editor.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+
+        # Apply Tags
+        self.setup_highlight_tags(self.editor)
+
+        # Pixel height of one line, used by visible-range calculations
+        self.line_height = tkfont.Font(font=self.editor.cget("font")).metrics("linespace")
+
+        # Bindings
+        self.editor.bind('<KeyRelease>', self.on_key_release)
+        self.editor.bind('<<Modified>>', self.on_modified)
+        self.editor.bind('<<Paste>>', self.on_paste)
+        self.editor.bind('<Configure>', self.on_view_changed)
+        self.editor.bind('<Map>', self.on_view_changed)
+        # Restoring a minimised window maps only the toplevel, not the editor
+        self.editor.winfo_toplevel().bind('<Map>', self.on_toplevel_mapped, add="+")
+        self.editor.configure(yscrollcommand=self.on_view_changed)
+
         # Initialize with one empty tab
-        self.create_new_tab("Untitled.lum")
+        self.create_new_tab(self.main_app.next_untitled_name())
 
     def create_new_tab(self, filename, filepath=None, content=""):
-        """Create a new tab with editor widget"""
+        """Create a new tab with its own buffer"""
         
         self.tab_counter += 1
         tab_id = self.tab_counter
-        tab_frame = ctk.CTkFrame(self.tab_buttons_frame, fg_color="transparent", width=140, height=30)
-        tab_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 0))
-        
-        # Tab Label
         display_name = filename
-        tab_label = ctk.CTkLabel(tab_frame, text=display_name, font=("Segoe UI", 11), text_color=self.main_app.colors["muted"])
-        tab_label.pack(side=tk.LEFT, padx=(12, 5), pady=6)
-        
-        # Close Button (x)
-        close_btn = ctk.CTkButton(tab_frame, text="✕", width=22, height=22,
-                                 command=lambda: self.close_tab(tab_id),
-                                 fg_color="transparent", hover_color="#c42b1c",
-                                 text_color=self.main_app.colors["muted"],
-                                 font=("Segoe UI", 10), corner_radius=6)
-        close_btn.pack(side=tk.LEFT, padx=(0, 8), pady=0)
-        
-        # Text Editor Widget
-        editor = tk.Text(self.editor_area,
-                         bg=self.main_app.colors["editor"],
-                         fg=self.main_app.colors["text"],
-                         font=("JetBrains Mono", 11),
-                         insertbackground=self.main_app.colors["accent"],
-                         selectbackground="#1e293b",
-                         relief=tk.FLAT,
-                         borderwidth=0,
-                         highlightthickness=0)
-        
-        editor.pack_forget()  
-        
-        # Insert Content
-        if content:
-            editor.insert("1.0", content)
-        
-        # Apply Tags
-        self.setup_highlight_tags(editor)
-        
-        # Bindings
-        def on_key_release(event):
-            self.highlight_syntax(editor)
-            
-            if filepath and content:
-                current_content = editor.get("1.0", tk.END).rstrip()
-                if current_content != content.rstrip():
-                    self.set_tab_changed(tab_id, True)
-        
-        editor.bind('<KeyRelease>', on_key_release)
+
+        if self.header_pool:
+            # Reuse the header of a closed tab instead of building new widgets
+            tab_frame, tab_label, close_btn = self.header_pool.pop()
+            tab_label.configure(text=display_name)
+            close_btn.configure(command=lambda: self.close_tab(tab_id))
+        else:
+            tab_frame = ctk.CTkFrame(self.tab_buttons_frame, fg_color="transparent", width=140, height=30)
+
+            # Tab Label
+            tab_label = ctk.CTkLabel(tab_frame, text=display_name, font=("Segoe UI", 11), text_color=self.main_app.colors["muted"])
+            tab_label.pack(side=tk.LEFT, padx=(12, 5), pady=6)
+
+            # Close Button (x)
+            close_btn = ctk.CTkButton(tab_frame, text="✕", width=22, height=22,
+                                     command=lambda: self.close_tab(tab_id),
+                                     fg_color="transparent", hover_color="#c42b1c",
+                                     text_color=self.main_app.colors["muted"],
+                                     font=("Segoe UI", 10), corner_radius=6)
+            close_btn.pack(side=tk.LEFT, padx=(0, 8), pady=0)
+        tab_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 0))
         
         # Store Data
         self.tabs[tab_id] = {
             'frame': tab_frame,
             'label': tab_label,
-            'editor': editor,
             'filename': filename,
             'filepath': filepath,
             'changed': False,
             'close_btn': close_btn,
-            'original_content': content,
-            'tokens': [] 
+            'tokens': _NO_TOKENS,
+            # Edited since the last lexer run, and the cache key that run produced
+            'lex_dirty': True,
+            'lex_key': None,
+            # Copy of the shown buffer's text, dropped on every edit and refetched on demand
+            'mirror': None,
+            # Buffer state while the tab is not shown in the editor
+            'content': content,
+            'tag_ranges': None,
+            'line_cache': {},
+            'insert_index': "1.0",
+            'yview': 0.0
         }
         
         # Tab Selection Logic
@@ -127,27 +328,28 @@ class TabbedEditor(ctk.CTkFrame):
         """Switch to specified tab"""
         if tab_id not in self.tabs:
             return
-            
-        # Hide all others
-        for tab_data in self.tabs.values():
-            tab_data['editor'].pack_forget()
-            tab_data['frame'].configure(fg_color="transparent")
-            tab_data['label'].configure(text_color=self.main_app.colors["muted"])
-        
-        # Show selected
+
         tab_data = self.tabs[tab_id]
-        tab_data['editor'].pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
-        tab_data['frame'].configure(fg_color=self.main_app.colors["panel"])
-        tab_data['label'].configure(text_color=self.main_app.colors["text"])
+
+        if tab_id != self.active_tab_id:
+            # Park the outgoing buffer and restyle its header
+            previous = self.tabs.get(self.active_tab_id)
+            if previous:
+                self.store_buffer(previous)
+                previous['frame'].configure(fg_color="transparent")
+                previous['label'].configure(text_color=self.main_app.colors["muted"])
+
+            # Show selected
+            self.active_tab_id = tab_id
+            self.load_buffer(tab_data)
+            tab_data['frame'].configure(fg_color=self.main_app.colors["panel"])
+            tab_data['label'].configure(text_color=self.main_app.colors["text"])
         
         # Update app state
         self.current_file = tab_data['filepath'] or tab_data['filename']
         
-        # Refresh highlighting
-        self.highlight_syntax(tab_data['editor'])
-        
         # --- Restore tokens and apply filter ---
-        current_tokens_from_tab = tab_data.get('tokens', [])
+        current_tokens_from_tab = tab_data.get('tokens', _NO_TOKENS)
         
         if hasattr(self.main_app, 'all_tokens'):
             self.main_app.all_tokens = current_tokens_from_tab
@@ -161,6 +363,56 @@ class TabbedEditor(ctk.CTkFrame):
         else:
             self.main_app.root.title(f"Lumina Studio - {tab_data['filename']}")
 
+    def store_buffer(self, tab_data):
+        """Save the editor's buffer, highlighting and cursor into a tab"""
+        editor = self.editor
+        tab_data['content'] = self.buffer_text()
+        tab_data['mirror'] = None
+        tab_data['insert_index'] = editor.index(tk.INSERT)
+        tab_data['yview'] = editor.yview()[0]
+
+        if self.cancel_pending_highlight():
+            # Highlighting never finished, redo it when the tab comes back
+            tab_data['tag_ranges'] = None
+        else:
+            tab_data['tag_ranges'] = {tag: tuple(map(str, editor.tag_ranges(tag))) for tag in _HL_TAGS}
+
+    def load_buffer(self, tab_data):
+        """Show a tab's buffer in the editor"""
+        editor = self.editor
+        content = tab_data['content']
+        editor.delete("1.0", tk.END)
+        editor.insert("1.0", content)
+        # The widget owns the text while the tab is shown, don't keep a second copy
+        tab_data['content'] = None
+        editor.mark_set(tk.INSERT, tab_data['insert_index'])
+        editor.yview_moveto(tab_data['yview'])
+        # Loading a buffer is not an edit
+        editor.edit_modified(False)
+
+        if tab_data['tag_ranges'] is None:
+            tab_data['line_cache'].clear()
+            if content:
+                self.highlight_syntax(editor)
+        else:
+            for tag, ranges in tab_data['tag_ranges'].items():
+                if ranges:
+                    editor.tag_add(tag, *ranges)
+
+    def on_modified(self, event):
+        """Mark the active tab as changed on edit"""
+        # Tk only raises <<Modified>> when its dirty flag flips, so re-arm it on every edit
+        if not self.editor.edit_modified():
+            return
+        self.editor.edit_modified(False)
+        tab_data = self.tabs.get(self.active_tab_id)
+        if not tab_data:
+            return
+        tab_data['lex_dirty'] = True
+        tab_data['mirror'] = None
+        if not tab_data['changed']:
+            self.set_tab_changed(self.active_tab_id, True)
+
     def close_tab(self, tab_id):
         """Close a tab"""
         if tab_id not in self.tabs:
@@ -179,12 +431,19 @@ class TabbedEditor(ctk.CTkFrame):
             elif response:
                 self.main_app.save_file(tab_id)
         
-        tab_data['editor'].destroy()
-        tab_data['frame'].destroy()
+        if tab_id == self.active_tab_id:
+            self.cancel_pending_highlight()
+            self.active_tab_id = None
+        if len(self.header_pool) < TAB_HEADER_POOL_SIZE:
+            tab_data['frame'].pack_forget()
+            self.header_pool.append((tab_data['frame'], tab_data['label'], tab_data['close_btn']))
+        else:
+            tab_data['frame'].destroy()
         del self.tabs[tab_id]
+        tab_data.clear()
         
         if not self.tabs:
-            self.create_new_tab("Untitled.lum")
+            self.create_new_tab(self.main_app.next_untitled_name())
         else:
             first_tab_id = next(iter(self.tabs))
             self.switch_to_tab(first_tab_id)
@@ -198,42 +457,210 @@ class TabbedEditor(ctk.CTkFrame):
         editor.tag_configure("NUMBER", foreground="#b5cea8")
         editor.tag_configure("CONTRACT", foreground="#c586c0")
 
+    def on_key_release(self, event):
+        """Queue the line under the cursor for re-highlighting"""
+        if event.keysym in _NAV_KEYSYMS:
+            return
+        editor = self.editor
+        line_start = editor.index("insert linestart")
+        line = editor.get(line_start, "insert lineend")
+
+        # Block comment delimiters can recolour other lines, so fall back to the view pass.
+        # The line's old COMMENT tag covers a delimiter that was just deleted.
+        if ("/*" in line or "*/" in line or "COMMENT" in editor.tag_names(f"{line_start} - 1c")
+                or editor.tag_nextrange("COMMENT", line_start, f"{line_start} lineend +1c")):
+            self.line_cache().clear()
+            self.schedule_highlight()
+            return
+        lineno = int(line_start.split(".")[0])
+        self.dirty_lines.add(lineno)
+        # Return leaves the cursor on the new line; the line it split changed too
+        if event.keysym in ("Return", "KP_Enter") and lineno > 1:
+            self.dirty_lines.add(lineno - 1)
+        self.schedule_highlight(full=False)
+
+    def on_paste(self, event):
+        """Pasted text can span many lines, highlight the view once it is inserted"""
+        self.line_cache().clear()
+        self.schedule_highlight()
+
+    def on_view_changed(self, *args):
+        """Scrolling or resizing brings new lines into view"""
+        self.schedule_highlight()
+
+    def on_toplevel_mapped(self, event):
+        """The window came back from being minimised; catch up on skipped highlighting"""
+        if event.widget is self.editor.winfo_toplevel():
+            self.schedule_highlight()
+
+    def schedule_highlight(self, full=True):
+        """Coalesce a burst of typing or scrolling into a single highlight pass"""
+        # A view pass also covers any dirty lines on screen, so it wins once requested
+        self.highlight_full = self.highlight_full or full
+        if self.highlight_after_id:
+            self.editor.after_cancel(self.highlight_after_id)
+        if self.highlight_full:
+            self.highlight_after_id = self.editor.after(HIGHLIGHT_DELAY_MS, self._flush_highlight)
+        else:
+            # A few dirty lines are cheap; colour them as soon as Tk has finished redrawing
+            self.highlight_after_id = self.editor.after_idle(self._flush_highlight)
+
+    def _flush_highlight(self):
+        self.highlight_after_id = None
+        # Viewable also checks the ancestors, so a minimised window counts as hidden
+        if not self.editor.winfo_viewable():
+            # Dirty lines still differ from the line cache, so the <Map> pass picks them up
+            self.cancel_pending_highlight()
+            return
+        if self.highlight_full:
+            self.highlight_syntax(self.editor)
+        else:
+            lines, self.dirty_lines = self.dirty_lines, set()
+            self.highlight_lines(self.editor, lines)
+
+    def cancel_pending_highlight(self):
+        """Cancel a queued highlight pass, returns True if one was pending"""
+        self.dirty_lines.clear()
+        self.highlight_full = False
+        if not self.highlight_after_id:
+            return False
+        self.editor.after_cancel(self.highlight_after_id)
+        self.highlight_after_id = None
+        return True
+
     def highlight_syntax(self, editor):
-        """Apply syntax highlighting"""
-        code = editor.get("1.0", tk.END)
-        for tag in ["KEYWORD", "TYPE", "STRING", "COMMENT", "NUMBER", "CONTRACT"]:
-            editor.tag_remove(tag, "1.0", tk.END)
-
-        patterns = [
-            ("COMMENT", r'//.*|/\*[\s\S]*?\*/'),
-            ("STRING", r'"[^"]*"'),
-            ("KEYWORD", r'\b(func|main|let|var|struct|type|if|else|switch|case|default|break|while|do|for|display|read|return)\b'),
-            ("CONTRACT", r'\b(requires|ensures|invariant)\b'),
-            ("TYPE", r'\b(int|float|double|string|bool|void|char)\b|[A-Z][a-zA-Z0-9_]*'),
-            ("NUMBER", r'\b\d+\b'),
-        ]
-
-        for tag, regex in patterns:
-            for match in re.finditer(regex, code):
-                start = f"1.0 + {match.start()} chars"
-                end = f"1.0 + {match.end()} chars"
-                editor.tag_add(tag, start, end)
+        """Apply syntax highlighting to the lines on screen"""
+        # Anything still queued is stale once the buffer is highlighted again
+        self.cancel_pending_highlight()
+        # Nothing is on screen to colour; the <Map> bindings highlight once it is
+        if not editor.winfo_viewable():
+            return
+        first, last = self.visible_range(editor)
+        first, last = self._changed_range(editor, first, last)
+        if first is not None:
+            self._highlight_range(editor, first, last)
+
+    def line_cache(self):
+        """Hashes of the active tab's lines as they were last highlighted"""
+        tab_data = self.tabs.get(self.active_tab_id)
+        return tab_data['line_cache'] if tab_data else {}
+
+    def _changed_range(self, editor, first, last):
+        """Narrow a range to the lines edited since they were last highlighted"""
+        cache = self.line_cache()
+        changed = []
+        start_line = int(first.split(".")[0])
+        for lineno, text in enumerate(editor.get(first, last).split("\n"), start_line):
+            h = hash(text)
+            if cache.get(lineno) != h:
+                cache[lineno] = h
+                changed.append((lineno, text))
+        if not changed:
+            return None, None
+
+        # Comment delimiters, lines inside a block comment, or lines that were coloured as
+        # a comment (a delimiter may have been deleted) need the whole range rescanned
+        lo, hi = changed[0][0], changed[-1][0]
+        if ("COMMENT" in editor.tag_names(f"{lo}.0 - 1c")
+                or editor.tag_nextrange("COMMENT", f"{lo}.0", f"{hi}.end +1c")
+                or any("/*" in t or "*/" in t for _, t in changed)):
+            # Lines below the view may have changed colour too; rehash them when they scroll in
+            last_line = int(last.split(".")[0])
+            for lineno in [n for n in cache if n > last_line]:
+                del cache[lineno]
+            return first, last
+        return f"{lo}.0", f"{hi}.end"
+
+    def visible_range(self, editor):
+        """Index range of the visible lines plus some overscan"""
+        height = editor.winfo_height()
+        overscan = max(height // self.line_height // 2, 10)
+        first = editor.index(f"@0,0 - {overscan} lines linestart")
+        last = editor.index(f"@0,{height} + {overscan} lines lineend")
+
+        # Block comments crossing either edge are scanned whole so they keep their colour
+        opener = editor.search("/*", first, backwards=True, stopindex="1.0")
+        if opener and not editor.search("*/", opener, stopindex=first):
+            first = editor.index(f"{opener} linestart")
+        opener = editor.search("/*", last, backwards=True, stopindex=first)
+        if opener and not editor.search("*/", opener, stopindex=last):
+            closer = editor.search("*/", last, stopindex=tk.END)
+            if closer:
+                last = editor.index(f"{closer} lineend")
+        return first, last
+
+    def highlight_lines(self, editor, lines):
+        """Apply syntax highlighting to the given line numbers"""
+        cache = self.line_cache()
+        for lineno in lines:
+            # Keys like Ctrl+C leave the line as it was last highlighted
+            h = hash(editor.get(f"{lineno}.0", f"{lineno}.end"))
+            if cache.get(lineno) != h:
+                self._highlight_range(editor, f"{lineno}.0", f"{lineno}.end")
+                cache[lineno] = h
+
+    def _highlight_range(self, editor, start, end):
+        """Apply syntax highlighting between two indices"""
+        code = editor.get(start, end)
+        for tag in _HL_TAGS:
+            editor.tag_remove(tag, start, end)
+
+        # Offsets of each line start in `code`, so matches map to "line.col" without Tk counting chars
+        base_line, base_col = map(int, editor.index(start).split("."))
+        line_starts = [0]
+        pos = code.find("\n")
+        while pos != -1:
+            line_starts.append(pos + 1)
+            pos = code.find("\n", pos + 1)
+
+        def to_position(offset):
+            row = bisect_right(line_starts, offset) - 1
+            col = offset - line_starts[row]
+            return base_line + row, col + base_col if row == 0 else col
+
+        # One pass over the text; earlier alternatives win, so comments and strings mask words
+        spans = {tag: [] for tag in _HL_TAGS}
+        for match in _HL_UNION.finditer(code):
+            tag = match.lastgroup
+            if tag == "WORD":
+                word = match.group()
+                tag = _HL_WORD_TAGS.get(word)
+                if tag is None:
+                    if not word[0].isupper():
+                        continue
+                    tag = "TYPE"
+            begin, finish = match.span()
+            line, col = to_position(begin)
+            # Most matches stay on one line, so the end is just the start column plus the length
+            if code.find("\n", begin, finish) == -1:
+                end_line, end_col = line, col + finish - begin
+            else:
+                end_line, end_col = to_position(finish)
+            spans[tag] += (f"{line}.{col}", f"{end_line}.{end_col}")
+
+        # One Tcl call per tag, tag_add takes any number of index pairs
+        for tag, indices in spans.items():
+            if indices:
+                editor.tag_add(tag, *indices)
 
     def get_current_editor(self):
-        for tab_data in self.tabs.values():
-            if tab_data['editor'].winfo_ismapped():
-                return tab_data['editor']
-        return None
+        return self.editor if self.active_tab_id in self.tabs else None
 
     def get_current_tab_id(self):
-        for tab_id, tab_data in self.tabs.items():
-            if tab_data['editor'].winfo_ismapped():
-                return tab_id
-        return None
+        return self.active_tab_id if self.active_tab_id in self.tabs else None
+
+    def buffer_text(self):
+        """Text of the active tab, only copied out of Tk once per edit"""
+        tab_data = self.tabs[self.active_tab_id]
+        if tab_data['mirror'] is None:
+            tab_data['mirror'] = self.editor.get("1.0", "end-1c")
+        return tab_data['mirror']
 
     def get_editor_content(self, tab_id):
+        if tab_id == self.active_tab_id:
+            return self.buffer_text().rstrip()
         if tab_id in self.tabs:
-            return self.tabs[tab_id]['editor'].get("1.0", tk.END).rstrip()
+            return self.tabs[tab_id]['content'].rstrip()
         return ""
 
     def set_tab_changed(self, tab_id, changed=True):
@@ -244,13 +671,27 @@ class TabbedEditor(ctk.CTkFrame):
             display_text = f"*{filename}" if changed else filename
             tab_data['label'].configure(text=display_text)
             
-            if tab_data['editor'].winfo_ismapped():
+            if tab_id == self.active_tab_id:
                 if changed:
                     self.main_app.root.title(f"Lumina Studio - *{filename}")
                 else:
                     self.main_app.root.title(f"Lumina Studio - {filename}")
 
 class LuminaIDE:
+    # Sidebar icon, decoded once and shared by every window
+    _icon_cache = None
+
+    @classmethod
+    def load_icon(cls):
+        if cls._icon_cache is None:
+            icon_path = "ui/icon.png"
+            try:
+                raw_image = Image.open(icon_path)
+            except Exception:
+                raw_image = Image.new("RGBA", (30, 30), color="#22d3ee")
+            cls._icon_cache = ctk.CTkImage(light_image=raw_image, dark_image=raw_image, size=(30, 30))
+        return cls._icon_cache
+
     def __init__(self, root):
         self.root = root
         self.root.title("Lumina Studio")
@@ -267,9 +708,26 @@ class LuminaIDE:
             "border": "#334155"
         }
 
+        # Numbering for new unsaved files, never reused within a session
+        self.untitled_counter = 0
+
+        # (length, hash) of lexed source -> (tokens, errors), oldest first
+        self.lex_cache = {}
+        # One lexer reused for every run; runs never overlap
+        self.lexer = LuminaLexer()
+        # Lexing runs on its own worker, kept off the Tk thread
+        self.worker_pool = ThreadPoolExecutor(max_workers=1)
+        # File reads and writes share a single worker, so they finish in the order they were
+        # requested: an older save never lands after a newer one, and a read sees earlier writes
+        self.file_pool = ThreadPoolExecutor(max_workers=1)
+
         self.root.grid_columnconfigure(1, weight=1)
         self.root.grid_rowconfigure(0, weight=1)
 
+        # --- Custom Style for Treeview ---
+        self.style = ttk.Style()
+        self.setup_styles()
+
         # 1. Sidebar
         self.sidebar = ctk.CTkFrame(root, width=200, corner_radius=0, fg_color=self.colors["sidebar"])
         self.sidebar.grid(row=0, column=0, rowspan=2, sticky="nsew")
@@ -306,23 +764,49 @@ class LuminaIDE:
         self.create_terminal_area()
 
 
+    def setup_styles(self):
+        """Configure ttk styles once for the whole window"""
+        style = self.style
+        style.theme_use("clam")
+        
+        # Remove White Border
+        style.layout("Treeview", [('Treeview.treearea', {'sticky': 'nswe'})])
+        
+        # General Config
+        style.configure("Treeview",
+                        background="#0b172b",
+                        foreground="#f8fafc",
+                        fieldbackground="#0b172b",
+                        borderwidth=0,
+                        rowheight=28, # Increased height
+                        font=("Segoe UI", 11))
+        
+        # Header Config
+        style.configure("Treeview.Heading",
+                        background="#1e293b",
+                        foreground="#f8fafc",
+                        relief="flat",
+                        borderwidth=0,
+                        font=("Segoe UI", 12, "bold"))
+        
+        # Map Rows
+        style.map("Treeview",
+                  background=[('selected', '#1e293b'), ('active', '#0b172b')], 
+                  foreground=[('selected', '#22d3ee'), ('active', '#f8fafc')])
+        
+        # Map Headings
+        style.map("Treeview.Heading",
+                  background=[('active', '#1e293b'), ('pressed', '#1e293b')], 
+                  foreground=[('active', '#f8fafc'), ('pressed', '#f8fafc')])
+
     def create_sidebar_content(self):
         header_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
         header_frame.grid(row=0, column=0, padx=16, pady=(18, 6), sticky="w")
         
-        icon_path = "ui/icon.png" 
-        try:
-            raw_image = Image.open(icon_path)
-            ctk_icon = ctk.CTkImage(light_image=raw_image, dark_image=raw_image, size=(30, 30))
-            icon_label = ctk.CTkLabel(header_frame, text="", image=ctk_icon)
-            icon_label.pack(side=tk.LEFT, padx=(0, 10))
-            icon_label.image = ctk_icon
-        except Exception:
-            empty_image = Image.new("RGBA", (30, 30), color="#22d3ee") 
-            ctk_icon_fallback = ctk.CTkImage(light_image=empty_image, dark_image=empty_image, size=(30, 30))
-            icon_label = ctk.CTkLabel(header_frame, text="", image=ctk_icon_fallback)
-            icon_label.pack(side=tk.LEFT, padx=(0, 10))
-            icon_label.image = ctk_icon_fallback
+        ctk_icon = self.load_icon()
+        icon_label = ctk.CTkLabel(header_frame, text="", image=ctk_icon)
+        icon_label.pack(side=tk.LEFT, padx=(0, 10))
+        icon_label.image = ctk_icon
 
         title_label = ctk.CTkLabel(header_frame, text="LUMINA", font=("Segoe UI", 22, "bold"), text_color=self.colors["text"])
         title_label.pack(side=tk.LEFT)
@@ -335,25 +819,19 @@ class LuminaIDE:
         buttons_container.grid_columnconfigure(0, weight=1)
         buttons_container.grid_rowconfigure(4, weight=1)
 
-        self.btn_new = ctk.CTkButton(buttons_container, text="📄  New File", command=self.add_new_file,
-                                     fg_color="transparent", border_width=0,
-                                     hover_color="#223043", corner_radius=6,
-                                     font=("Segoe UI", 13), anchor="w",
-                                     text_color=self.colors["text"])
+        # Shared look of the file action buttons
+        nav_btn_opts = dict(fg_color="transparent", border_width=0,
+                            hover_color="#223043", corner_radius=6,
+                            font=("Segoe UI", 13), anchor="w",
+                            text_color=self.colors["text"])
+
+        self.btn_new = ctk.CTkButton(buttons_container, text="📄  New File", command=self.add_new_file, **nav_btn_opts)
         self.btn_new.grid(row=0, column=0, padx=8, pady=4, sticky="ew")
 
-        self.btn_open = ctk.CTkButton(buttons_container, text="📂  Open File", command=self.open_file,
-                                     fg_color="transparent", border_width=0,
-                                     hover_color="#223043", corner_radius=6,
-                                     font=("Segoe UI", 13), anchor="w",
-                                     text_color=self.colors["text"])
+        self.btn_open = ctk.CTkButton(buttons_container, text="📂  Open File", command=self.open_file, **nav_btn_opts)
         self.btn_open.grid(row=1, column=0, padx=8, pady=4, sticky="ew")
 
-        self.btn_save = ctk.CTkButton(buttons_container, text="💾  Save File", command=self.save_current_file,
-                                     fg_color="transparent", border_width=0,
-                                     hover_color="#223043", corner_radius=6,
-                                     font=("Segoe UI", 13), anchor="w",
-                                     text_color=self.colors["text"])
+        self.btn_save = ctk.CTkButton(buttons_container, text="💾  Save File", command=self.save_current_file, **nav_btn_opts)
         self.btn_save.grid(row=2, column=0, padx=8, pady=4, sticky="ew")
 
         self.btn_run = ctk.CTkButton(buttons_container, text="▶  Run Lexer", command=self.run_lexer,
@@ -406,40 +884,6 @@ class LuminaIDE:
         tree_container = ctk.CTkFrame(self.table_frame, fg_color=self.colors["panel"], corner_radius=0)
         tree_container.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
         
-        # --- Custom Style for Treeview ---
-        style = ttk.Style()
-        style.theme_use("clam")
-        
-        # Remove White Border
-        style.layout("Treeview", [('Treeview.treearea', {'sticky': 'nswe'})])
-        
-        # General Config
-        style.configure("Treeview",
-                        background="#0b172b",
-                        foreground="#f8fafc",
-                        fieldbackground="#0b172b",
-                        borderwidth=0,
-                        rowheight=28, # Increased height
-                        font=("Segoe UI", 11))
-        
-        # Header Config
-        style.configure("Treeview.Heading",
-                        background="#1e293b",
-                        foreground="#f8fafc",
-                        relief="flat",
-                        borderwidth=0,
-                        font=("Segoe UI", 12, "bold"))
-        
-        # Map Rows
-        style.map("Treeview",
-                  background=[('selected', '#1e293b'), ('active', '#0b172b')], 
-                  foreground=[('selected', '#22d3ee'), ('active', '#f8fafc')])
-        
-        # Map Headings
-        style.map("Treeview.Heading",
-                  background=[('active', '#1e293b'), ('pressed', '#1e293b')], 
-                  foreground=[('active', '#f8fafc'), ('pressed', '#f8fafc')])
-
         # Create Treeview
         columns = ("line", "type", "lexeme")
         self.tree = ttk.Treeview(tree_container, columns=columns, show="headings", selectmode="browse")
@@ -455,8 +899,9 @@ class LuminaIDE:
         
         # --- ORIGINAL SCROLLBAR (Restored) ---
         scrollbar = ctk.CTkScrollbar(tree_container, orientation="vertical", command=self.tree.yview)
+        self.tree_scrollbar = scrollbar
         
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.configure(yscrollcommand=self.on_tree_scrolled)
         
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -475,100 +920,90 @@ class LuminaIDE:
         self.tree.tag_configure("evenrow", background="#0b172b") 
         self.tree.tag_configure("oddrow", background="#112138")  
         
-        self.all_tokens = []     
-        self.current_tokens = [] 
-        self.render_tokens([])
+        self.all_tokens = _NO_TOKENS
+        self.current_tokens = _NO_TOKENS
+        self.token_rows = []
+        self.render_after_id = None
+        # Leading rows of token_rows currently present in the tree
+        self.rendered_rows = 0
+        # Token list and filter choice behind the rows on screen, if apply_filter put them there
+        self.filtered_from = None
+        self.filtered_choice = None
+        self.render_tokens(_NO_TOKENS)
 
     def apply_filter(self, choice):
         if not hasattr(self, 'all_tokens') or not self.all_tokens:
-            self.render_tokens([])
+            self.render_tokens(_NO_TOKENS)
             return
 
-        filtered_list = []
-
-        def is_error(token):
-            t_type = token['type'].upper()
-            return "INVALID" in t_type or "ERROR" in t_type or "UNKNOWN" in t_type
+        # Switching back to a tab with the same result and filter leaves the table as it is
+        if self.all_tokens is self.filtered_from and choice == self.filtered_choice:
+            return
 
         if choice == "Show: All":
             filtered_list = self.all_tokens
-            
-        elif choice == "Show: Errors":
-            filtered_list = [t for t in self.all_tokens if is_error(t)]
-            
-        elif choice == "Show: Identifiers":
-            filtered_list = [
-                t for t in self.all_tokens 
-                if "ID" in t['type'] and not is_error(t)
-            ]
-            
-        elif choice == "Show: Keywords":
-            filtered_list = [
-                t for t in self.all_tokens 
-                if "KEYWORD" in t['type'] and not is_error(t)
-            ]
-            
-        elif choice == "Show: Literals":
-            literals = ["STRING", "INTEGER", "FLOAT", "CHAR", "BOOL"]
-            filtered_list = [
-                t for t in self.all_tokens 
-                if any(lit in t['type'] for lit in literals) and not is_error(t)
-            ]
-        
-        elif choice == "Show: Noise Words":
-            filtered_list = [
-                t for t in self.all_tokens 
-                if "NOISE" in t['type'] and not is_error(t)
-            ]
-            
-        elif choice == "Show: Operators":
-            filtered_list = [
-                t for t in self.all_tokens 
-                if "OP" in t['type'] and not is_error(t)
-            ]
-            
-        elif choice == "Show: Symbols":
-            filtered_list = [
-                t for t in self.all_tokens 
-                if "SYMBOL" in t['type'] and not is_error(t)
-            ]
+        else:
+            category = _FILTER_CATEGORIES.get(choice)
+            filtered_list = self.all_tokens.select(category)
 
         self.render_tokens(filtered_list)
+        self.filtered_from, self.filtered_choice = self.all_tokens, choice
 
     def render_tokens(self, tokens):
+        self.filtered_from = None
+        # Token columns are never changed in place, so the same object means the same rows
+        if tokens is self.current_tokens:
+            return
         self.current_tokens = tokens 
+        old_rows = self.token_rows
+        # (line, type, lexeme) strings shared by the table rows and the token exports
+        self.token_rows = tokens.rows
         
         if not hasattr(self, 'tree'):
             return
 
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        if not tokens:
-            return
-
-        for i, token in enumerate(tokens):
-            t_type = str(token['type']).upper()
-            tag = "NORMAL"
-            
-            if "INVALID" in t_type or "ERROR" in t_type or "UNKNOWN" in t_type:
-                tag = "ERROR"
-            elif any(lit in t_type for lit in ["STRING", "INTEGER", "FLOAT", "CHAR", "BOOL"]):
-                tag = "LITERAL"
-            elif "KEYWORD" in t_type:
-                tag = "KEYWORD"
-            elif "ID" in t_type:
-                tag = "ID"
-            elif "OP" in t_type:
-                tag = "OP"
-            elif "SYMBOL" in t_type:
-                tag = "SYMBOL"
-            elif "NOISE" in t_type:
-                tag = "NOISE"
-            
+        # A newer result replaces whatever is still being inserted
+        if self.render_after_id:
+            self.root.after_cancel(self.render_after_id)
+            self.render_after_id = None
+
+        # Rows matching the start of the new result stay; only the tail is replaced
+        common = 0
+        limit = min(self.rendered_rows, len(self.token_rows))
+        while common < limit and old_rows[common] == self.token_rows[common]:
+            common += 1
+
+        if common < self.rendered_rows:
+            self.tree.delete(*[f"t{i}" for i in range(common, self.rendered_rows)])
+        self.rendered_rows = common
+
+        if common < len(self.token_rows):
+            self._render_batch(common)
+
+    def on_tree_scrolled(self, first, last):
+        """Keep the scrollbar in sync and load more rows as the view nears the end"""
+        self.tree_scrollbar.set(first, last)
+        if (float(last) >= TOKEN_PREFETCH_AT and not self.render_after_id
+                and self.rendered_rows < len(self.token_rows)):
+            self.render_after_id = self.root.after_idle(self._render_batch, self.rendered_rows)
+
+    def _render_batch(self, start):
+        """Insert the next batch of rows; later batches load as the table is scrolled"""
+        self.render_after_id = None
+        end = min(start + TOKEN_BATCH_ROWS, len(self.token_rows))
+        # Call the Tcl command directly, skipping ttk's per-row option formatting
+        tk_call, tree_path = self.tree.tk.call, self.tree._w
+
+        categories = self.current_tokens.categories
+        for i in range(start, end):
+            row = self.token_rows[i]
+            tag = categories[i]
             row_tag = "evenrow" if i % 2 == 0 else "oddrow"
             
-            self.tree.insert("", "end", values=(token['line'], token['type'], token['lexeme']), tags=(tag, row_tag))
+            # Row position doubles as the item id, so Tk doesn't have to generate one
+            tk_call(tree_path, "insert", "", "end", "-id", f"t{i}", "-values", row, "-tags", (tag, row_tag))
+
+        self.rendered_rows = end
 
     def create_terminal_area(self):
         header = ctk.CTkFrame(self.terminal_frame, fg_color=self.colors["panel"], height=25, corner_radius=0)
@@ -591,12 +1026,16 @@ class LuminaIDE:
         
         self.console_output.config(state=tk.DISABLED)
 
+        # Messages waiting for the next flush, as alternating text/tag pairs for Text.insert
+        self.log_queue = []
+
     # --- File Operations ---
+    def next_untitled_name(self):
+        self.untitled_counter += 1
+        return "Untitled.lum" if self.untitled_counter == 1 else f"Untitled{self.untitled_counter}.lum"
+
     def add_new_file(self):
-        untitled_count = sum(1 for tab in self.tabbed_editor.tabs.values() 
-                           if tab['filename'].startswith("Untitled"))
-        filename = f"Untitled{untitled_count + 1}.lum" if untitled_count > 0 else "Untitled.lum"
-        
+        filename = self.next_untitled_name()
         self.tabbed_editor.create_new_tab(filename)
         self.log_console(f"Created new file: {filename}")
 
@@ -604,34 +1043,88 @@ class LuminaIDE:
         file_path = filedialog.askopenfilename(
             filetypes=[("Lumina Files", "*.lum"), ("Text Files", "*.txt"), ("All Files", "*.*")]
         )
-        if file_path:
-            try:
-                with open(file_path, "r") as file:
-                    content = file.read()
-                
-                filename = os.path.basename(file_path)
-                
-                for tab_id, tab_data in self.tabbed_editor.tabs.items():
-                    if tab_data['filepath'] == file_path:
-                        self.tabbed_editor.switch_to_tab(tab_id)
-                        self.log_console(f"Switched to already open file: {filename}")
-                        return
-                
-                tab_id = self.tabbed_editor.create_new_tab(filename, file_path, content)
-                self.tabbed_editor.set_tab_changed(tab_id, False)
-                self.log_console(f"Opened: {filename}")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to open file: {str(e)}")
+        if not file_path:
+            return
+
+        filename = os.path.basename(file_path)
+
+        if self._switch_to_open_file(file_path, filename):
+            return
+
+        def on_loaded(content):
+            # The same file may have been opened again while this read was running
+            if self._switch_to_open_file(file_path, filename):
+                return
+            tab_id = self.tabbed_editor.create_new_tab(filename, file_path, content)
+            self.tabbed_editor.set_tab_changed(tab_id, False)
+            self.log_console(f"Opened: {filename}")
+
+        self.run_in_background(
+            lambda: self._read_file(file_path),
+            on_loaded,
+            lambda e: self._on_open_failed(filename, e),
+            pool=self.file_pool
+        )
+
+    def _on_open_failed(self, filename, e):
+        if isinstance(e, UnicodeDecodeError):
+            messagebox.showerror("Error", f"Failed to open file: {filename} is not valid UTF-8 text ({e.reason} at byte {e.start}).")
+        else:
+            messagebox.showerror("Error", f"Failed to open file: {str(e)}")
+
+    def _switch_to_open_file(self, file_path, filename):
+        """Show the tab already holding file_path, returns True if there was one"""
+        for tab_id, tab_data in self.tabbed_editor.tabs.items():
+            if tab_data['filepath'] == file_path:
+                self.tabbed_editor.switch_to_tab(tab_id)
+                self.log_console(f"Switched to already open file: {filename}")
+                return True
+        return False
+
+    def _read_file(self, file_path):
+        # Text mode, so CRLF and CR line endings reach the editor as plain newlines.
+        # Decoding is strict: replacing bad bytes would let the next save destroy them.
+        with open(file_path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def _write_file(self, file_path, content):
+        # Write to a uniquely named file beside the target and swap it in, so a failed write
+        # never truncates the file and overlapping saves never share a temp file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(content)
+            # mkstemp creates the file owner-only; give it the mode a plain open() would
+            if os.path.exists(file_path):
+                shutil.copymode(file_path, temp_path)
+            else:
+                os.chmod(temp_path, 0o666 & ~_UMASK)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def run_in_background(self, work, on_done, on_error, pool=None):
+        """Run blocking work off the Tk thread and deliver its result back on it"""
+        future = (pool or self.worker_pool).submit(work)
+
+        # Tk is not thread-safe, so the worker never touches widgets; the loop polls for it
+        def poll():
+            if not future.done():
+                self.root.after(BACKGROUND_POLL_MS, poll)
+            elif future.exception() is not None:
+                on_error(future.exception())
+            else:
+                on_done(future.result())
+
+        self.root.after(BACKGROUND_POLL_MS, poll)
 
     def save_current_file(self):
         current_tab_id = self.tabbed_editor.get_current_tab_id()
         if current_tab_id:
             self.save_file(current_tab_id)
             
-            tokens = [[str(t["line"]), str(t["type"]), str(t["lexeme"])] for t in self.current_tokens]
-            
-            if tokens:
+            if self.token_rows:
                 response = messagebox.askyesno(
                     "Save Token Table",
                     "Do you also want to save the token table?"
@@ -648,19 +1141,12 @@ class LuminaIDE:
                             defaultextension=".txt",
                             initialfile=f"{base_name}_tokens.txt",
                             initialdir=parent_dir,
-                            filetypes=[("Text Files", "*.txt"), ("CSV Files", "*.csv"), ("All Files", "*.*")],
+                            filetypes=_TOKEN_TABLE_FILETYPES,
                             title="Save Token Table As"
                         )
                         
                         if token_file_path:
-                            try:
-                                if token_file_path.lower().endswith('.csv'):
-                                    self._save_as_csv(token_file_path, tokens)
-                                else:
-                                    self._save_as_text(token_file_path, tokens)
-                                self.log_console(f"Token table saved to: {os.path.basename(token_file_path)}")
-                            except Exception as e:
-                                messagebox.showerror("Error", f"Failed to save token table: {str(e)}")
+                            self.export_token_table(token_file_path)
 
     def save_file(self, tab_id):
         if tab_id not in self.tabbed_editor.tabs:
@@ -679,109 +1165,160 @@ class LuminaIDE:
             tab_data['filename'] = os.path.basename(file_path)
             tab_data['label'].configure(text=tab_data['filename'])
         
-        try:
-            content = self.tabbed_editor.get_editor_content(tab_id)
-            with open(tab_data['filepath'], "w") as file:
-                file.write(content)
-            
-            self.tabbed_editor.set_tab_changed(tab_id, False)
-            self.log_console(f"Code saved: {tab_data['filename']}")
-            
-        except Exception as e:
+        content = self.tabbed_editor.get_editor_content(tab_id)
+        file_path = tab_data['filepath']
+        filename = tab_data['filename']
+
+        # Clear the flag up front so edits made while the write runs mark the tab again
+        self.tabbed_editor.set_tab_changed(tab_id, False)
+
+        def on_error(e):
+            self.tabbed_editor.set_tab_changed(tab_id, True)
             messagebox.showerror("Error", f"Failed to save file: {str(e)}")
 
+        self.run_in_background(
+            lambda: self._write_file(file_path, content),
+            lambda _: self.log_console(f"Code saved: {filename}"),
+            on_error,
+            pool=self.file_pool
+        )
+
     def save_token_table(self):
-        tokens = [[str(t["line"]), str(t["type"]), str(t["lexeme"])] for t in self.current_tokens]
-        
-        if not tokens:
+        if not self.token_rows:
             messagebox.showwarning("Warning", "No tokens to save! Run analysis first.")
             return
         
         file_path = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text Files", "*.txt"), ("CSV Files", "*.csv"), ("All Files", "*.*")],
+            filetypes=_TOKEN_TABLE_FILETYPES,
             title="Save Token Table As"
         )
         
         if not file_path:
             return
-        
-        try:
-            if file_path.lower().endswith('.csv'):
-                self._save_as_csv(file_path, tokens)
+
+        self.export_token_table(file_path)
+
+    def export_token_table(self, file_path):
+        """Write the shown token rows as CSV or text on a worker thread"""
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == '.csv':
+            writer = self._save_as_csv
+        elif extension == '.parquet' and pq is not None:
+            writer = self._save_as_parquet
+        else:
+            writer = self._save_as_text
+        rows = iter(self.token_rows)
+        # Stamped once, when the user saves, rather than whenever the worker gets to it
+        generated_on = self._get_current_timestamp()
+        self.run_in_background(
+            lambda: writer(file_path, rows, generated_on),
+            lambda _: self.log_console(f"Token table saved to: {os.path.basename(file_path)}"),
+            lambda e: messagebox.showerror("Error", f"Failed to save token table: {str(e)}"),
+            pool=self.file_pool
+        )
+
+    def _save_as_text(self, file_path, tokens, generated_on):
+        token_counts = Counter()
+        with open(file_path, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_BYTES) as f:
+            f.writelines((
+                _TXT_DOUBLE_RULE,
+                "LEXICAL ANALYSIS TOKEN TABLE\n",
+                _TXT_DOUBLE_RULE,
+                f"Generated on: {generated_on}\n",
+                _TXT_RULE,
+                _TXT_HEADER,
+                _TXT_RULE,
+            ))
+            f.writelines(self._format_token_lines(tokens, token_counts))
+            f.writelines((
+                _TXT_RULE,
+                f"Total tokens: {sum(token_counts.values())}\n",
+                _TXT_DOUBLE_RULE,
+            ))
+            self._add_token_statistics(f, token_counts)
+        # Only useful within one export; don't keep lexemes alive between saves
+        _text_row_tail.cache_clear()
+
+    def _format_token_lines(self, tokens, token_counts):
+        """Yield text table lines, tallying token types on the way through"""
+        for line, token_type, lexeme in tokens:
+            token_counts[token_type] += 1
+            yield line.ljust(6) + _text_row_tail(token_type, lexeme)
+
+    def _save_as_csv(self, file_path, tokens, generated_on):
+        token_counts = Counter()
+        with open(file_path, 'w', newline='', encoding='utf-8', buffering=EXPORT_BUFFER_BYTES) as f:
+            csv.writer(f).writerow(["Line", "Token Type", "Lexeme"])
+            f.writelines(self._format_csv_lines(tokens, token_counts))
+            f.write(f"\n# Generated on: {generated_on}\n")
+            f.write(f"# Total tokens: {sum(token_counts.values())}\n")
+            self._add_token_statistics(f, token_counts, csv_format=True)
+
+    def _format_csv_lines(self, tokens, token_counts):
+        """Yield CSV lines, tallying token types; only rows that need quoting go through csv"""
+        quoted = io.StringIO()
+        writer = csv.writer(quoted)
+        for line, token_type, lexeme in tokens:
+            token_counts[token_type] += 1
+            if _CSV_NEEDS_QUOTING(lexeme):
+                writer.writerow((line, token_type, lexeme))
+                yield quoted.getvalue()
+                quoted.seek(0)
+                quoted.truncate()
             else:
-                self._save_as_text(file_path, tokens)
-            
-            self.log_console(f"Token table saved to: {os.path.basename(file_path)}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save token table: {str(e)}")
-
-    def _save_as_text(self, file_path, tokens):
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write("=" * 60 + "\n")
-            f.write("LEXICAL ANALYSIS TOKEN TABLE\n")
-            f.write("=" * 60 + "\n")
-            f.write(f"Generated on: {self._get_current_timestamp()}\n")
-            f.write("-" * 60 + "\n")
-            f.write(f"{'Line':<6} | {'Token Type':<20} | {'Lexeme'}\n")
-            f.write("-" * 60 + "\n")
-            
-            for line, token_type, lexeme in tokens:
-                line_str = str(line) if not isinstance(line, str) else line
-                token_type_str = str(token_type) if not isinstance(token_type, str) else token_type
-                lexeme_str = str(lexeme) if not isinstance(lexeme, str) else lexeme
-                
-                formatted_lexeme = lexeme_str
-                if len(lexeme_str) > 30:
-                    formatted_lexeme = lexeme_str[:27] + "..."
-                
-                f.write(f"{line_str:<6} | {token_type_str:<20} | {formatted_lexeme}\n")
-            
-            f.write("-" * 60 + "\n")
-            f.write(f"Total tokens: {len(tokens)}\n")
-            f.write("=" * 60 + "\n")
-            self._add_token_statistics(f, tokens)
-
-    def _save_as_csv(self, file_path, tokens):
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Line", "Token Type", "Lexeme"])
-            for token in tokens:
-                writer.writerow(token)
-            f.write(f"\n# Generated on: {self._get_current_timestamp()}\n")
-            f.write(f"# Total tokens: {len(tokens)}\n")
-            self._add_token_statistics(f, tokens, csv_format=True)
+                yield f"{line},{token_type},{lexeme}\r\n"
+
+    def _save_as_parquet(self, file_path, tokens, generated_on):
+        """Columnar export with the token type dictionary-encoded; no per-row formatting"""
+        lines, token_types, lexemes = list(zip(*tokens)) or ((), (), ())
+        table = pa.table({
+            "line": pa.array([int(line) for line in lines], type=pa.int32()),
+            "token_type": pa.array(token_types, type=pa.string()).dictionary_encode(),
+            "lexeme": pa.array(lexemes, type=pa.string()),
+        })
+        table = table.replace_schema_metadata({"generated_on": generated_on})
+        pq.write_table(table, file_path, compression="zstd")
 
     def _get_current_timestamp(self):
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    def _add_token_statistics(self, file_handle, tokens, csv_format=False):
-        token_counts = {}
-        for _, token_type, _ in tokens:
-            token_type_str = str(token_type) if not isinstance(token_type, str) else token_type
-            token_counts[token_type_str] = token_counts.get(token_type_str, 0) + 1
-        
+    def _add_token_statistics(self, file_handle, token_counts, csv_format=False):
+        # Build the whole block first and hand it to the file in one write
         if csv_format:
-            file_handle.write("# Token Statistics:\n")
-            for token_type, count in sorted(token_counts.items()):
-                file_handle.write(f"# {token_type}: {count}\n")
+            lines = ["# Token Statistics:\n"]
+            fmt = "# {}: {}\n".format
         else:
-            file_handle.write("\nToken Statistics:\n")
-            file_handle.write("-" * 40 + "\n")
-            for token_type, count in sorted(token_counts.items()):
-                file_handle.write(f"{token_type:<20}: {count:>4}\n")
+            lines = ["\nToken Statistics:\n", "-" * 40 + "\n"]
+            fmt = "{:<20}: {:>4}\n".format
+        lines.extend(fmt(token_type, count) for token_type, count in sorted(token_counts.items()))
+        file_handle.write("".join(lines))
 
     def log_console(self, message, msg_type="normal"):
-        self.console_output.config(state=tk.NORMAL)
+        self.log_console_bulk((message,), msg_type)
+
+    def log_console_bulk(self, messages, msg_type="normal"):
+        """Queue several lines of one type as a single tagged block"""
         prefix = ">> "
         if msg_type == "error":
             prefix = "!! "
         elif msg_type == "success":
             prefix = "OK "
-        self.console_output.insert(tk.END, f"{prefix}{message}\n", msg_type)
-        self.console_output.see(tk.END)
-        self.console_output.config(state=tk.DISABLED)
+        # Queue the block; a burst of messages reaches the widget in a single flush
+        if not self.log_queue:
+            self.root.after_idle(self._flush_log)
+        self.log_queue += ("".join(f"{prefix}{message}\n" for message in messages), msg_type)
+
+    def _flush_log(self):
+        """Write queued messages to the console and drop lines past the cap"""
+        console = self.console_output
+        console.config(state=tk.NORMAL)
+        console.insert(tk.END, *self.log_queue)
+        self.log_queue = []
+        if int(console.index("end-1c").split(".")[0]) > CONSOLE_MAX_LINES:
+            console.delete("1.0", f"end - {CONSOLE_MAX_LINES + 1} lines linestart")
+        console.see(tk.END)
+        console.config(state=tk.DISABLED)
 
     def run_lexer(self):
         editor = self.tabbed_editor.get_current_editor()
@@ -790,49 +1327,84 @@ class LuminaIDE:
         if not editor:
             messagebox.showwarning("Warning", "No active editor!")
             return
+
+        # Nothing typed since the last run: reuse its result without copying the buffer out of Tk
+        tab_data = self.tabbed_editor.tabs[current_tab_id]
+        if not tab_data['lex_dirty'] and tab_data['lex_key'] in self.lex_cache:
+            self.log_console("Running Lexical Analysis...", "normal")
+            self._on_lexer_done(current_tab_id, *self.lex_cache[tab_data['lex_key']])
+            return
             
-        source_code = editor.get("1.0", tk.END).strip()
-        if not source_code:
+        # An empty widget is caught without copying anything out of Tk; no strip() copy either,
+        # the lexer skips whitespace itself and leading blank lines keep their line numbers
+        source_code = "" if editor.compare("end-1c", "==", "1.0") else self.tabbed_editor.buffer_text()
+        if not source_code or source_code.isspace():
             if current_tab_id:
-                self.tabbed_editor.tabs[current_tab_id]['tokens'] = []
+                self.tabbed_editor.tabs[current_tab_id]['tokens'] = _NO_TOKENS
             
-            self.all_tokens = []
-            self.render_tokens([])
+            self.all_tokens = _NO_TOKENS
+            self.render_tokens(_NO_TOKENS)
             self.log_console("Source code is empty.", "error")
             return
 
         self.log_console("Running Lexical Analysis...", "normal")
 
-        try:
-            lexer = LuminaLexer(source_code)
-            tokens = lexer.tokenize()
+        # Unchanged source gives the same tokens, no need to lex it again
+        cache_key = (len(source_code), hash(source_code))
+        tab_data['lex_dirty'] = False
+        tab_data['lex_key'] = cache_key
+        cached = self.lex_cache.get(cache_key)
+        if cached is not None:
+            self._on_lexer_done(current_tab_id, *cached)
+            return
 
-            normalized = [{"line": token.line, "type": token.type, "lexeme": token.value} for token in tokens]
-            
-            self.all_tokens = normalized 
-            
-            if current_tab_id:
-                self.tabbed_editor.tabs[current_tab_id]['tokens'] = normalized
+        # Lex on a worker thread; the button stays off so runs never overlap
+        self.btn_run.configure(state="disabled")
+
+        # Tokens are turned into table entries as the lexer yields them, so the raw
+        # token list is never held alongside the normalised one
+        def lex():
+            self.lexer.reset(source_code)
+            return _normalize_tokens(self.lexer), self.lexer.errors
+
+        def on_done(result):
+            if len(self.lex_cache) >= LEX_CACHE_SIZE:
+                del self.lex_cache[next(iter(self.lex_cache))]
+            self.lex_cache[cache_key] = result
+            self._on_lexer_done(current_tab_id, *result)
+
+        self.run_in_background(lex, on_done, lambda e: self._on_lexer_failed(current_tab_id, e))
+
+    def _on_lexer_done(self, tab_id, normalized, errors):
+        self.btn_run.configure(state="normal")
+
+        if tab_id in self.tabbed_editor.tabs:
+            self.tabbed_editor.tabs[tab_id]['tokens'] = normalized
 
+        # Only show the result if its tab is still the one on screen
+        if tab_id == self.tabbed_editor.get_current_tab_id():
+            self.all_tokens = normalized
             self.apply_filter(self.filter_var.get())
-            
-            if hasattr(lexer, 'errors') and lexer.errors:
-                self.log_console(f"Analysis completed with {len(lexer.errors)} error(s):", "error")
-                for err in lexer.errors:
-                    self.log_console(f"  {err}", "error")
-                messagebox.showerror("Lexical Errors", f"Found {len(lexer.errors)} lexical errors.\nCheck terminal for details.")
-            else:
-                self.log_console(f"Success! Generated {len(tokens)} tokens with no errors.", "success")
-            
-        except Exception as e:
-            self.all_tokens = []
-            self.render_tokens([])
-            if current_tab_id:
-                self.tabbed_editor.tabs[current_tab_id]['tokens'] = []
-            self.log_console(f"CRITICAL ERROR: {str(e)}", "error")
 
+        if errors:
+            self.log_console(f"Analysis completed with {len(errors)} error(s):", "error")
+            self.log_console_bulk([f"  {err}" for err in errors], "error")
+            messagebox.showerror("Lexical Errors", f"Found {len(errors)} lexical errors.\nCheck terminal for details.")
+        else:
+            self.log_console(f"Success! Generated {len(normalized)} tokens with no errors.", "success")
+
+    def _on_lexer_failed(self, tab_id, e):
+        self.btn_run.configure(state="normal")
+        if tab_id in self.tabbed_editor.tabs:
+            self.tabbed_editor.tabs[tab_id]['tokens'] = _NO_TOKENS
+        if tab_id == self.tabbed_editor.get_current_tab_id():
+            self.all_tokens = _NO_TOKENS
+            self.render_tokens(_NO_TOKENS)
+        self.log_console(f"CRITICAL ERROR: {str(e)}", "error")
 
 if __name__ == "__main__":
+    # Hand the GIL back to the Tk loop more often while the lexer thread runs
+    sys.setswitchinterval(0.005)
     root = ctk.CTk()
     app = LuminaIDE(root)
     root.mainloop()
\ No newline at end of file